@@ -1,5 +1,5 @@
 # Licensed with the 3-clause BSD license.  See LICENSE for details.
-from itertools import cycle
+from itertools import repeat
 from logging import Logger
 
 import numpy as np
@@ -26,6 +26,26 @@ from .exceptions import (
 )
 
 
+def _session_settings_listener(settings):
+    """Engine connect listener that applies PostgreSQL settings.
+
+    A closure rather than an SBDB method, so that the engine does not
+    hold a reference back to the SBDB object.
+
+    """
+
+    def configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for parameter, value in settings.items():
+            cursor.execute('SET {} = %s'.format(parameter), (value,))
+        cursor.close()
+
+        # keep the settings when the pool rolls back this transaction
+        dbapi_connection.commit()
+
+    return configure
+
+
 class SBDB:
     """Database object for SBSearch.
 
@@ -36,20 +56,47 @@ class SBDB:
         The sqlalchemy-formatted database URL or a sqlalchmey session
         to use.
 
-    *args
-        `sqlalchemy.create_engine` arguments.
+    *args, **kwargs
+        `sqlalchemy.create_engine` arguments.  For psycopg2
+        connections, ``executemany_mode`` defaults to ``'values'`` so
+        that bulk inserts whose primary keys are already set, e.g.,
+        observations with ``obsid``, are sent as multi-row ``INSERT``
+        statements.  Rows with autoincrement keys (ephemerides, found
+        objects) are still inserted one at a time.
+
+
+    Notes
+    -----
+    PostgreSQL connections created from a URL are configured with
+    ``SESSION_SETTINGS``.  The default raises ``work_mem`` so that the
+    sorts and hashes of large spatial queries stay in memory rather
+    than spilling to temporary files.  Subclass and replace
+    the dictionary to tune these values.
 
     """
 
     DB_NAMES = ['obj', 'eph', 'obs', 'generic_obs', 'found']
 
-    def __init__(self, url_or_session, *args):
+    # per-connection PostgreSQL run-time parameters
+    SESSION_SETTINGS = {
+        'work_mem': '64MB'
+    }
+
+    def __init__(self, url_or_session, *args, **kwargs):
         if isinstance(url_or_session, Session):
             self.session = url_or_session
             self.engine = self.session.get_bind()
             self.sessionmaker = None
         else:
-            self.engine = sa.create_engine(url_or_session, *args)
+            url = sa.engine.url.make_url(url_or_session)
+            if url.drivername in ['postgresql', 'postgresql+psycopg2']:
+                kwargs.setdefault('executemany_mode', 'values')
+
+            self.engine = sa.create_engine(url, *args, **kwargs)
+            if url.get_backend_name() == 'postgresql':
+                sa.event.listen(self.engine, 'connect',
+                                _session_settings_listener(
+                                    self.SESSION_SETTINGS))
             self.sessionmaker = sa.orm.sessionmaker(bind=self.engine)
             self.session = self.sessionmaker()
 
@@ -90,8 +137,9 @@ class SBDB:
 
         # 30 s exposures
         exptime = 30 / 86400
+        observations = []
         for i in range(N_tiles**2):
-            obs = GenericObs(
+            observations.append(GenericObs(
                 obsid=i,
                 jd_start=2458119.5 + exptime * i,
                 jd_stop=2458119.5 + exptime * (i + 1),
@@ -100,8 +148,8 @@ class SBDB:
                 exposure=exptime,
                 seeing=1.5,
                 airmass=1.3,
-                maglimit=25)
-            db.session.add(obs)
+                maglimit=25))
+        db.add_observations(observations, hilbert_sort=True)
 
         db.add_ephemeris(2, '500', 2458119.5, 2458121.5, step='1d',
                          source='jpl', cache=True)
@@ -121,12 +169,12 @@ class SBDB:
 
         """
 
-        metadata = sa.MetaData()
-        metadata.reflect(self.engine)
+        # table names are enough, avoid reflecting every table
+        tables = set(sa.inspect(self.engine).get_table_names())
 
         missing = False
         for name in self.DB_NAMES + names:
-            if name not in metadata.tables.keys():
+            if name not in tables:
                 missing = True
                 logger.error('{} is missing from database'.format(name))
 
@@ -179,37 +227,47 @@ class SBDB:
         eph = ephem.generate(desg, location, epochs, source=source,
                              cache=cache)
 
+        # convert columns once, then build rows from plain arrays
+        n = len(eph)
         jd = util.epochs_to_jd(eph['Date'].value)
-        coords = RADec(eph['RA'], eph['Dec'])
         vmag = util.vmag_from_eph(eph)
-
-        for i in range(len(eph)):
-            # save ephemeris segment, which is used for
-            # searching, yes they overlap
-            p0 = max(i - 1, 0)
-            p1 = min(len(eph) - 1, i + 1)
-
-            segment = 'SRID=40001;LINESTRING({} {}, {} {})'.format(
-                eph['RA'][p0].to('deg').value,
-                eph['Dec'][p0].to('deg').value,
-                eph['RA'][p1].to('deg').value,
-                eph['Dec'][p1].to('deg').value)
-
+        rh = eph['r'].value
+        delta = eph['Delta'].value
+        ra = eph['RA'].to('rad').value
+        dec = eph['Dec'].to('rad').value
+        dra = eph['dRA cos(Dec)'].to('arcsec/hr').value
+        ddec = eph['ddec'].to('arcsec/hr').value
+        unc_a = eph['SMAA_3sigma'].to('rad').value
+        unc_b = eph['SMIA_3sigma'].to('rad').value
+        unc_theta = eph['Theta_3sigma'].to('rad').value
+
+        # save ephemeris segment, which is used for searching, yes
+        # they overlap
+        ra_deg = eph['RA'].to('deg').value
+        dec_deg = eph['Dec'].to('deg').value
+        p0 = np.maximum(np.arange(n) - 1, 0)
+        p1 = np.minimum(np.arange(n) + 1, n - 1)
+        segments = [
+            'SRID=40001;LINESTRING({} {}, {} {})'.format(*v)
+            for v in zip(ra_deg[p0], dec_deg[p0], ra_deg[p1], dec_deg[p1])
+        ]
+
+        for i in range(n):
             # ephemeris table data
             data = Eph(
                 objid=objid,
                 jd=jd[i],
-                rh=eph['r'][i].value,
-                delta=eph['Delta'][i].value,
-                ra=eph['RA'][i].to('rad').value,
-                dec=eph['Dec'][i].to('rad').value,
-                dra=eph['dRA cos(Dec)'][i].to('arcsec/hr').value,
-                ddec=eph['ddec'][i].to('arcsec/hr').value,
-                unc_a=eph['SMAA_3sigma'][i].to('rad').value,
-                unc_b=eph['SMIA_3sigma'][i].to('rad').value,
-                unc_theta=eph['Theta_3sigma'][i].to('rad').value,
+                rh=rh[i],
+                delta=delta[i],
+                ra=ra[i],
+                dec=dec[i],
+                dra=dra[i],
+                ddec=ddec[i],
+                unc_a=unc_a[i],
+                unc_b=unc_b[i],
+                unc_theta=unc_theta[i],
                 vmag=vmag[i],
-                segment=segment,
+                segment=segments[i],
                 retrieved=today
             )
             self.session.add(data)
@@ -379,7 +437,8 @@ class SBDB:
         self.session.commit()
         return obj.objid
 
-    def add_observations(self, observations, update=False, logger=None):
+    def add_observations(self, observations, update=False, logger=None,
+                         hilbert_sort=False):
         """Add observations to database.
 
         If observations already exist for a given observation ID, the
@@ -397,6 +456,12 @@ class SBDB:
         logger : `~logging.Logger`, optional
             Log messages to this logger.
 
+        hilbert_sort : bool, optional
+            Insert observations in Hilbert curve order of their FOV
+            centroids and mid-times.  Spatially and temporally nearby
+            observations are stored together, which gives a more
+            compact spatial index for bulk loads.
+
         Returns
         -------
         n : int
@@ -410,13 +475,16 @@ class SBDB:
             SELECT setval('obs_obsid_seq', MAX(obsid)) FROM obs
             ''')
 
-        n = 0
-        for obs in observations:
-            if update:
+        observations = list(observations)
+        if hilbert_sort:
+            observations = util.hilbert_sort(observations)
+
+        if update:
+            for obs in observations:
                 self.session.merge(obs)
-            else:
-                self.session.add(obs)
-            n += 1
+        else:
+            self.session.add_all(observations)
+        n = len(observations)
 
         try:
             self.session.commit()
@@ -830,32 +898,26 @@ class SBDB:
             stop = util.epochs_to_jd(stop)
         else:
             stop = util.epochs_to_jd([stop])[0]
-        obs = self.session.query(source)
-
-        filters = []
         if isinstance(shape, (list, tuple)):
-            _starts = start if np.iterable(start) else cycle(start)
-            _stops = stop if np.iterable(stop) else cycle(stop)
-            for _shape, _start, _stop in zip(shape, _starts, _stops):
-                filt = [source.fov.ST_Intersects(_shape)]
-                if _start is not None:
-                    filt.append(source.jd_stop >= _start)
-
-                if _stop is not None:
-                    filt.append(source.jd_start <= _stop)
+            shapes = shape
+            starts = start if np.iterable(start) else repeat(start)
+            stops = stop if np.iterable(stop) else repeat(stop)
+        else:
+            shapes, starts, stops = [shape], [start], [stop]
 
-                filters.append(sa.and_(*filt))
+        # one pass over the shapes, OR-ing each shape's constraints
+        filters = []
+        for _shape, _start, _stop in zip(shapes, starts, stops):
+            filt = [source.fov.ST_Intersects(_shape)]
+            if _start is not None:
+                filt.append(source.jd_stop >= _start)
 
-            obs = obs.filter(sa.or_(*filters))
-        else:
-            obs = obs.filter(source.fov.ST_Intersects(shape))
-            if start is not None:
-                obs = obs.filter(source.jd_stop >= start)
+            if _stop is not None:
+                filt.append(source.jd_start <= _stop)
 
-            if stop is not None:
-                obs = obs.filter(source.jd_start <= stop)
+            filters.append(sa.and_(*filt))
 
-        return obs
+        return self.session.query(source).filter(sa.or_(*filters))
 
     def observation_covers(self, obs, c):
         """Test if the observation covers the coordinate.
@@ -874,10 +936,47 @@ class SBDB:
 
         """
 
+        # convex FOVs are tested locally, without a database query
+        try:
+            return bool(util.interior_test(c, util.fov_vertices(obs.fov)))
+        except ValueError:
+            pass
+
         point = str(Point(c))
         covered = self.session.query(obs.fov.ST_Covers(point)).scalar()
         return covered
 
+    def rebuild_spatial_index(self, cluster=False):
+        """Rebuild observation and ephemeris spatial indices.
+
+        Run after bulk loads, e.g., ``add_observations`` with
+        ``hilbert_sort=True``, to get compact indices and fresh planner
+        statistics.
+
+
+        Parameters
+        ----------
+        cluster : bool, optional
+            Also physically reorder the tables by their spatial index
+            with ``CLUSTER``, which rebuilds all of their indices.  The
+            tables are locked while this runs.
+
+        """
+
+        self.session.commit()
+        for table, column in (('obs', 'fov'), ('eph', 'segment')):
+            # index names follow GeoAlchemy 2's convention
+            index = 'idx_{}_{}'.format(table, column)
+            if cluster:
+                self.session.execute('CLUSTER {} USING {}'.format(
+                    table, index))
+            else:
+                self.session.execute('REINDEX INDEX {}'.format(index))
+
+            self.session.execute('ANALYZE {}'.format(table))
+
+        self.session.commit()
+
     def resolve_objects(self, objects):
         """Resolve objects to database object ID and designation.
 
@@ -1,8 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import sys
+import math
 import time
+import weakref
 import logging
-import numpy as np
+import logging.handlers
 from astropy.time import Time
 
 
@@ -31,9 +33,9 @@ def setup(filename='sbsearch.log', name='SBSearch', level=None):
     # This test allows logging to work when it is run multiple times
     # from ipython
     if len(logger.handlers) == 0:
-        formatter = ElapsedFormatter(
-            '%(asctime)10s (%(dt).2f/%(dt0).2f) %(levelname)s: '
-            '[%(funcName)s] %(message)s', "%Y-%m-%d %H:%M:%S")
+        fmt = ('%(asctime)10s (%(dt).2f/%(dt0).2f) %(levelname)s: '
+               '[%(funcName)s] %(message)s', "%Y-%m-%d %H:%M:%S")
+        formatter = ElapsedFormatter(*fmt)
 
         console = logging.StreamHandler(sys.stdout)
         if not level:
@@ -42,16 +44,29 @@ def setup(filename='sbsearch.log', name='SBSearch', level=None):
         logger.addHandler(console)
 
         logfile = logging.FileHandler(filename)
+        # separate elapsed-time state: file records are formatted
+        # when the buffer is flushed
+        file_formatter = ElapsedFormatter(*fmt)
+        logfile.setFormatter(file_formatter)
+
+        # buffer file output, flushing on warnings or when full
+        buffered = logging.handlers.MemoryHandler(
+            1000, flushLevel=logging.WARNING, target=logfile)
         if not level:
-            logfile.setLevel(logging.INFO)
-        file_formatter = logging.Formatter(
-            '%(asctime)s %(levelname)s: - %(message)s')
-        logfile.setFormatter(formatter)
-        logger.addHandler(logfile)
+            buffered.setLevel(logging.INFO)
+        logger.addHandler(buffered)
+
+        # flush and close with the logger, or at exit
+        weakref.finalize(logger, _close_handlers, buffered, logfile)
 
     return logger
 
 
+def _close_handlers(*handlers):
+    for handler in handlers:
+        handler.close()
+
+
 class ProgressWidget:
     pass
 
@@ -82,6 +97,7 @@ class ProgressBar(ProgressWidget):
     def __enter__(self):
         self.i = 0
         self.last_tenths = 0
+        self._next = self._threshold(1)
         self._logger(tenths=0)
         return self
 
@@ -97,12 +113,19 @@ class ProgressBar(ProgressWidget):
         else:
             print(msg)
 
+    def _threshold(self, tenths):
+        # first step at which the bar reaches `tenths`
+        return -(-tenths * self.n // 10)
+
     def update(self):
         self.i += 1
-        tenths = int(self.i / self.n * 10)
-        if tenths != self.last_tenths:
-            self.last_tenths = tenths
-            self._logger(tenths=tenths)
+        if self.i < self._next:
+            return
+
+        tenths = self.i * 10 // self.n
+        self.last_tenths = tenths
+        self._next = self._threshold(tenths + 1)
+        self._logger(tenths=tenths)
 
 
 class ProgressTriangle(ProgressWidget):
@@ -136,10 +159,10 @@ class ProgressTriangle(ProgressWidget):
         self.base = base
         if base:
             if base == 2:
-                self._log = np.log2
+                self._log = math.log2
                 self.logger.info('Base-2 dots')
             elif base == 10:
-                self._log = np.log10
+                self._log = math.log10
                 self.logger.info('Base-10 dots')
             else:
                 raise ValueError('base must be 2 or 10')
@@ -168,22 +191,27 @@ class ProgressTriangle(ProgressWidget):
     def reset(self):
         self.i = 0
         self.t0 = Time.now()
+        self._next = self.base**self.n if self.base else self.n
 
     def update(self, n=1):
         last = self.i
         self.i += n
 
-        msg = None
+        # only compute dots when the next one is due
+        if self.i < self._next:
+            return
+
         if self.base:
             if last == 0:
                 return
 
-            logi = self._log(self.i)
-            if (self._log(last) % self.n) >= (logi % self.n):
-                self._logger(dots=int(logi // self.n))
+            dots = self._log(self.i) // self.n
+            self._next = self.base**((dots + 1) * self.n)
         else:
-            if (last % self.n) >= (self.i % self.n):
-                self._logger(dots=int(self.i // self.n))
+            dots = self.i // self.n
+            self._next = (dots + 1) * self.n
+
+        self._logger(dots=int(dots))
 
     def done(self):
         self._logger('{:.0f} seconds elapsed.'.format(self.dt))
@@ -77,6 +77,8 @@ class SBSearch:
         self.db.session.commit()
         self.db.session.close()
         self.logger.debug('Disconnected from database.')
+        for handler in self.logger.handlers:
+            handler.flush()
 
     def add_found(self, *args, **kwargs):
         return self.db.add_found(*args, **kwargs)
@@ -86,7 +88,8 @@ class SBSearch:
         return self.db.add_found_by_id(*args, **kwargs)
     add_found_by_id.__doc__ = SBDB.add_found_by_id.__doc__
 
-    def add_observations(self, observations, update=False):
+    def add_observations(self, observations, update=False,
+                         hilbert_sort=False):
         """Add observations to database.
 
         If observations already exist for a given observation ID, the
@@ -101,6 +104,10 @@ class SBSearch:
         update : bool, optional
             Update database in case of duplicates
 
+        hilbert_sort : bool, optional
+            Insert observations in Hilbert curve order.  See
+            `~sbsearch.db.SBDB.add_observations`.
+
         Returns
         -------
         n : int
@@ -108,7 +115,8 @@ class SBSearch:
 
         """
         n = self.db.add_observations(
-            observations, update=update, logger=self.logger)
+            observations, update=update, logger=self.logger,
+            hilbert_sort=hilbert_sort)
 
         if n < len(observations):
             loglevel = self.logger.warning
@@ -489,19 +497,17 @@ class SBSearch:
 
         """
 
-        found = self.db.session.query(Found)
+        cols = ('foundid', 'objid', 'obsid', 'jd', 'ra', 'dec', 'dra',
+                'ddec', 'unc_a', 'unc_b', 'unc_theta', 'vmag', 'rh',
+                'rdot', 'delta', 'phase', 'selong', 'sangle', 'vangle',
+                'trueanomaly', 'tmtp')
+        found = self.db.session.query(*[getattr(Found, k) for k in cols])
         found = util.filter_by_date_range(found, start, stop, Found.jd)
         if objects is not None:
             objids = [obj[0] for obj in self.db.resolve_objects(objects)]
             found = found.filter(Found.objid.in_(objids))
 
-        rows = []
-        cols = ('foundid', 'objid', 'obsid', 'jd', 'ra', 'dec', 'dra',
-                'ddec', 'unc_a', 'unc_b', 'unc_theta', 'vmag', 'rh',
-                'rdot', 'delta', 'phase', 'selong', 'sangle', 'vangle',
-                'trueanomaly', 'tmtp')
-        for row in found:
-            rows.append([getattr(row, k) for k in cols])
+        rows = found.all()
 
         if len(rows) == 0:
             return None
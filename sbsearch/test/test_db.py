@@ -52,6 +52,10 @@ class TestSBDB:
         metadata.reflect()
         assert 'test' in metadata.tables.keys()
 
+    def test_session_settings(self, db):
+        work_mem = db.session.execute('SHOW work_mem').scalar()
+        assert work_mem == SBDB.SESSION_SETTINGS['work_mem']
+
     def test_create_test_db(self, db):
         # just exercise the code
         assert db is not None
@@ -281,6 +285,48 @@ class TestSBDB:
         # for N_tiles == 10, ephemeris will fully be in just one box
         assert nobs == 1
 
+    def test_get_observations_intersecting_list(self, db):
+        eph = db.get_ephemeris(2, None, None).all()
+        fov = str(FieldOfView(RADec.from_eph(eph)))
+        start = min([e.jd for e in eph])
+        stop = max([e.jd for e in eph])
+
+        nobs = (db.get_observations_intersecting([fov, fov], start=start,
+                                                 stop=stop)
+                .count())
+        assert nobs == 1
+
+        nobs = (db.get_observations_intersecting([fov, fov],
+                                                 start=[start, start],
+                                                 stop=[stop, stop])
+                .count())
+        assert nobs == 1
+
+    def test_rebuild_spatial_index(self, db):
+        db.rebuild_spatial_index()
+        db.rebuild_spatial_index(cluster=True)
+        c = db.session.query(Obs).count()
+        assert c == N_tiles**2
+
+    def test_observation_covers(self, db):
+        # convex FOV, tested locally: tile 0 is RA 0 to 36, Dec -90 to -72
+        obs = db.get_observations_by_id([0]).one()
+        assert db.observation_covers(obs, RADec(18, -80, unit='deg'))
+        assert not db.observation_covers(obs, RADec(50, -80, unit='deg'))
+
+        # non-convex FOV, tested by the database
+        obs = [Obs(
+            obsid=1000,
+            jd_start=2450005.0,
+            jd_stop=2450010.0,
+            fov='SRID=40001;POLYGON((0 0, 1 1, 1 -1, -1 -1, -1 1, 0 0))',
+        )]
+        db.add_observations(obs)
+        db.session.expire_all()
+        obs = db.get_observations_by_id([1000]).one()
+        assert db.observation_covers(obs, RADec(0, -0.5, unit='deg'))
+        assert not db.observation_covers(obs, RADec(0, 0.5, unit='deg'))
+
     def test_resolve_objects(self, db):
         objid, desg = list(zip(*db.resolve_objects([1, '2P'])))
         assert objid[0] == 1
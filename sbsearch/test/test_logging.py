@@ -13,6 +13,24 @@ def test_setup():
     assert logger.level == pylogging.ERROR
 
 
+def test_setup_file(tmpdir):
+    filename = str(tmpdir.join('test.log'))
+    logger = logging.setup(filename=filename)
+    for i in range(3):
+        logger.info('test')
+    for handler in logger.handlers:
+        handler.flush()
+
+    with open(filename) as inf:
+        lines = inf.readlines()
+    assert len(lines) == 3
+
+    # elapsed time since the previous record is never negative
+    for line in lines:
+        dt = float(line.split('(')[1].split('/')[0])
+        assert dt >= 0
+
+
 def test_ProgressBar_stdout(capsys):
     N = 137
     with logging.ProgressBar(N) as progress:
@@ -1,6 +1,7 @@
 # Licensed with the 3-clause BSD license.  See LICENSE for details.
 import struct
 import sqlite3
+from datetime import datetime
 
 import pytest
 import numpy as np
@@ -125,11 +126,72 @@ def test_epochs_to_time():
     assert np.allclose(t.jd, (2458119.5, 2455000.5))
 
 
+def test_epochs_to_time_mixed_formats():
+    t = util.epochs_to_time(['2018-01-01', '2018:002', 2455000.5,
+                             datetime(2018, 1, 3), '2018-01-04'])
+    assert np.allclose(t.jd, (2458119.5, 2458120.5, 2455000.5, 2458121.5,
+                              2458122.5))
+
+
 def test_epochs_to_jd():
     jd = util.epochs_to_jd(['2018-01-01', 2455000.5])
     assert np.allclose(jd, (2458119.5, 2455000.5))
 
 
+def test_fov_vertices():
+    fov = 'SRID=40001;POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))'
+    vertices = util.fov_vertices(fov)
+    assert np.allclose(vertices, ((0, 0), (0, 1), (1, 1), (1, 0)))
+
+
+def test_hilbert_index():
+    x, y = np.meshgrid(np.arange(4), np.arange(4), indexing='ij')
+    points = np.array((x.ravel(), y.ravel()))
+    h = util.hilbert_index(points, bits=2)
+    assert sorted(h) == list(range(16))
+
+    # consecutive points along the curve are neighbors
+    p = points[:, np.argsort(h)]
+    assert np.all(np.abs(np.diff(p, axis=1)).sum(0) == 1)
+
+
+def test_hilbert_index_error():
+    with pytest.raises(ValueError):
+        util.hilbert_index(np.zeros((5, 2)), bits=16)
+
+
+@pytest.mark.parametrize('vertices', (
+    ((0, 0), (0, 1), (1, 1), (1, 0)),
+    ((1, 0), (1, 1), (0, 1), (0, 0)),
+    ((0, 1), (1, 1), (1, 0), (0, 0)),
+))
+def test_interior_test(vertices):
+    assert util.interior_test(RADec(0.5, 0.5, unit='deg'), vertices)
+    assert not util.interior_test(RADec(1.5, 0.5, unit='deg'), vertices)
+    assert util.interior_test(RADec(0, 0.5, unit='deg'), vertices)
+
+    inside = util.interior_test(RADec([0.5, -0.5], [0.5, 0.5], unit='deg'),
+                                vertices)
+    assert list(inside) == [True, False]
+
+
+def test_interior_test_edge():
+    vertices = ((10, 20), (30, 20), (30, 30), (10, 30))
+    a = RADec(10, 20, unit='deg').xyz
+    b = RADec(30, 20, unit='deg').xyz
+    x, y, z = util._slerp(a[:, np.newaxis], b[:, np.newaxis],
+                          np.linspace(0, 1, 50))
+    edge = RADec(np.arctan2(y, x), np.arctan2(z, np.hypot(x, y)),
+                 unit='rad')
+    assert np.all(util.interior_test(edge, vertices))
+
+
+def test_interior_test_error():
+    vertices = ((0, 0), (1, 1), (1, -1), (-1, -1), (-1, 1))
+    with pytest.raises(ValueError):
+        util.interior_test(RADec(0.5, 0, unit='deg'), vertices)
+
+
 def test_rd2xyz():
     from numpy import pi
     ra = [0, pi / 2, pi, 3 * pi / 2, 0, 0]
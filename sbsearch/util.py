@@ -3,11 +3,11 @@
 import struct
 import numpy as np
 from astropy.time import Time
-import astropy.coordinates as coords
 from astropy.coordinates import Angle
 from astropy.coordinates.angle_utilities import angular_separation
 import astropy.units as u
 import geoalchemy2
+import geoalchemy2.shape
 from . import schema
 
 
@@ -65,7 +65,7 @@ class RADec:
 
     @property
     def xyz(self):
-        return rd2xyz(self.ra, self.dec)
+        return rd2xyz(self.ra.rad, self.dec.rad)
 
 
 class FieldOfView:
@@ -215,16 +215,37 @@ def epochs_to_time(epochs, scale='utc'):
 
     """
 
-    times = []
-    for epoch in epochs:
+    if isinstance(epochs, np.ndarray) and epochs.dtype.kind in 'iuf':
+        return Time(epochs.astype(float), format='jd', scale=scale)
+
+    # group by input type so that each group is a single Time call
+    epochs = list(epochs)
+    groups = {}
+    for i, epoch in enumerate(epochs):
         if isinstance(epoch, (float, int)):
-            format = 'jd'
+            key = 'jd'
+        elif isinstance(epoch, Time):
+            key = 'astropy_time'
         else:
-            format = None
+            key = type(epoch)
+        groups.setdefault(key, []).append(i)
+
+    jd1 = np.empty(len(epochs))
+    jd2 = np.empty(len(epochs))
+    for key, i in groups.items():
+        format = key if isinstance(key, str) else None
+        try:
+            t = Time([epochs[j] for j in i], format=format, scale=scale)
+        except ValueError:
+            # mixed formats within a type, e.g., ISO and year-day strings
+            t = Time([Time(epochs[j], format=format, scale=scale)
+                      for j in i])
+            t = getattr(t, scale)
 
-        times.append(Time(epoch, format=format, scale=scale))
+        jd1[i] = t.jd1
+        jd2[i] = t.jd2
 
-    return Time(times)
+    return Time(jd1, jd2, format='jd', scale=scale)
 
 
 def epochs_to_jd(epochs):
@@ -292,15 +313,222 @@ def filter_by_date_range(query, start, stop, column):
     return query
 
 
+def fov_vertices(fov):
+    """Field of view polygon vertices.
+
+
+    Parameters
+    ----------
+    fov : string or geoalchemy2 element
+        PostGIS formatted polygon, e.g., ``Obs.fov``.
+
+
+    Returns
+    -------
+    vertices : ndarray
+        ``(N, 2)`` array of RA, Dec in degrees.  The closing vertex
+        is not repeated.
+
+    """
+
+    if isinstance(fov, str):
+        ring = fov[fov.index('((') + 2:fov.index(')')]
+        vertices = np.array([v.split() for v in ring.split(',')], float)
+    else:
+        polygon = geoalchemy2.shape.to_shape(fov)
+        vertices = np.array(polygon.exterior.coords)
+
+    if len(vertices) > 1 and np.all(vertices[0] == vertices[-1]):
+        vertices = vertices[:-1]
+
+    return vertices
+
+
+def hilbert_index(points, bits=16):
+    """Hilbert curve index of points.
+
+    Each dimension is independently scaled to the range of the data,
+    then mapped onto a Hilbert curve with Skilling's algorithm
+    (Skilling 2004, AIP Conf. Proc. 707, 381).
+
+
+    Parameters
+    ----------
+    points : array
+        ``(D, N)`` array of ``N`` points in ``D`` dimensions.
+
+    bits : int, optional
+        Bits per dimension.  ``D * bits`` must be <= 64.
+
+
+    Returns
+    -------
+    h : ndarray
+        Hilbert index of each point, dtype uint64.
+
+    """
+
+    points = np.atleast_2d(np.asarray(points, float))
+    D = points.shape[0]
+    if D * bits > 64:
+        raise ValueError('D * bits must be <= 64')
+
+    lo = points.min(1)[:, np.newaxis]
+    span = np.ptp(points, 1)[:, np.newaxis]
+    span[span == 0] = 1
+    X = ((points - lo) / span * (2**bits - 1)).round().astype(np.uint64)
+
+    # axes to transposed Hilbert index, undo excess work
+    Q = 1 << (bits - 1)
+    while Q > 1:
+        P = np.uint64(Q - 1)
+        for i in range(D):
+            flip = (X[i] & np.uint64(Q)) != 0
+            t = np.where(flip, 0, (X[0] ^ X[i]) & P).astype(np.uint64)
+            X[0] = np.where(flip, X[0] ^ P, X[0] ^ t)
+            if i != 0:
+                X[i] ^= t
+        Q >>= 1
+
+    # Gray encode
+    for i in range(1, D):
+        X[i] ^= X[i - 1]
+    t = np.zeros(X.shape[1], np.uint64)
+    Q = 1 << (bits - 1)
+    while Q > 1:
+        t = np.where((X[D - 1] & np.uint64(Q)) != 0,
+                     t ^ np.uint64(Q - 1), t)
+        Q >>= 1
+    X ^= t
+
+    # interleave transposed bits into a single index
+    h = np.zeros(X.shape[1], np.uint64)
+    for b in range(bits - 1, -1, -1):
+        for i in range(D):
+            h = (h << np.uint64(1)) | ((X[i] >> np.uint64(b)) & np.uint64(1))
+
+    return h
+
+
+def hilbert_sort(observations, bits=16):
+    """Sort observations along a Hilbert curve.
+
+    Observations are ordered by the Hilbert index of their FOV
+    centroid (x, y, z) and mid-time.
+
+
+    Parameters
+    ----------
+    observations : list of Obs
+        Observations to sort.
+
+    bits : int, optional
+        Bits per dimension.
+
+
+    Returns
+    -------
+    observations : list of Obs
+        Sorted observations.
+
+    """
+
+    if len(observations) < 2:
+        return list(observations)
+
+    points = np.empty((4, len(observations)))
+    for i, obs in enumerate(observations):
+        vertices = np.radians(fov_vertices(obs.fov))
+        points[:3, i] = rd2xyz(vertices[:, 0], vertices[:, 1]).mean(1)
+        points[3, i] = (obs.jd_start + obs.jd_stop) / 2
+
+    order = np.argsort(hilbert_index(points, bits=bits), kind='stable')
+    return [observations[i] for i in order]
+
+
+def interior_test(point, vertices):
+    """Test if points are inside a convex spherical polygon.
+
+    Polygon edges are great circles.  Points on an edge are
+    considered inside.
+
+
+    Parameters
+    ----------
+    point : RADec
+        Point(s) to test.
+
+    vertices : array
+        ``(N, 2)`` array of polygon RA, Dec in degrees, in order, e.g.,
+        from `fov_vertices`.
+
+
+    Returns
+    -------
+    inside : bool or ndarray
+
+
+    Raises
+    ------
+    ValueError
+        If the polygon is not convex.
+
+    """
+
+    v = np.radians(vertices)
+    v = rd2xyz(v[:, 0], v[:, 1]).T
+
+    # unit edge normals (zero for repeated vertices); each must have
+    # the centroid on the same side
+    n = np.cross(v, np.roll(v, -1, axis=0))
+    norm = np.sqrt((n**2).sum(1))
+    n /= np.where(norm == 0, 1, norm)[:, np.newaxis]
+    centroid = v.sum(0)
+    centroid /= np.sqrt((centroid**2).sum())
+    ref = np.sign(n @ centroid)
+
+    # tolerance for round-off of points on an edge
+    tol = -1e-12
+    if np.any((n @ v.T) * ref[:, np.newaxis] < tol):
+        raise ValueError('polygon is not convex')
+
+    side = (n @ point.xyz) * ref.reshape((-1,) + (1,) * (point.xyz.ndim - 1))
+    return np.all(side >= tol, axis=0)
+
+
 def rd2xyz(ra, dec):
-    """RA, Dec (radians or Angle) to Cartesian coordinates."""
-    return np.array((np.cos(dec) * np.cos(ra),
-                     np.cos(dec) * np.sin(ra),
-                     np.sin(dec)))
+    """RA, Dec (radians or Angle) to Cartesian coordinates.
+
+
+    Parameters
+    ----------
+    ra, dec : float, array-like, or `~astropy.coordinates.Angle`
+        Coordinates to convert.
+
+
+    Returns
+    -------
+    xyz : ndarray
+        Unit vectors, shape ``(3,) + np.shape(ra)``.
+
+    """
+
+    if isinstance(ra, Angle):
+        ra = ra.rad
+    if isinstance(dec, Angle):
+        dec = dec.rad
+
+    ra = np.asarray(ra, float)
+    dec = np.asarray(dec, float)
+    cdec = np.cos(dec)
+    return np.stack((cdec * np.cos(ra), cdec * np.sin(ra), np.sin(dec)))
 
 
 def spherical_interpolation(c0, c1, t0, t1, t2):
-    """Spherical interpolation by rotation.
+    """Spherical linear interpolation (SLERP) along a great circle.
+
+    The point is placed along the great circle from `c0` to `c1` at
+    the fractional time ``(t2 - t0) / (t1 - t0)``.
 
 
     Parameters
@@ -329,17 +557,45 @@ def spherical_interpolation(c0, c1, t0, t1, t2):
     if t2 == t1:
         return c1
 
-    dt = (t2 - t0) / (t1 - t0)
-    w = c0.separation(c1)
+    f = (t2 - t0) / (t1 - t0)
+    x, y, z = _slerp(c0.xyz, c1.xyz, f)
+    ra = np.arctan2(y, x)
+    dec = np.arctan2(z, np.hypot(x, y))
+    return RADec(ra, dec, unit='rad')
+
+
+def _slerp(a, b, f):
+    """Spherical linear interpolation between unit vectors.
+
+
+    Parameters
+    ----------
+    a, b : array
+        Unit vectors, shape ``(3, ...)``.
+
+    f : float or array
+        Fractional distance from `a` to `b`.
+
+
+    Returns
+    -------
+    c : ndarray
+        Interpolated unit vector(s).
+
+    """
+
+    cosw = np.clip((a * b).sum(0), -1, 1)
+    w = np.arccos(cosw)
+    sinw = np.sin(w)
+    small = w < 1e-8
 
-    a = c0.xyz
-    b = c1.xyz
-    n = np.cross(a, b)
-    n /= np.sqrt((n**2).sum())
+    # fall back to a linear blend for nearly coincident points
+    sinw = np.where(small, 1, sinw)
+    fa = np.where(small, 1 - f, np.sin((1 - f) * w) / sinw)
+    fb = np.where(small, f, np.sin(f * w) / sinw)
 
-    c = vector_rotate(a, n, w * dt)
-    d, dec, ra = coords.cartesian_to_spherical(*c)
-    return RADec(ra, dec)
+    c = fa * a + fb * b
+    return c / np.sqrt((c**2).sum(0))
 
 
 def vector_rotate(r, n, th):
@@ -362,7 +618,9 @@ def vector_rotate(r, n, th):
     Notes
     -----
     Described in Goldstein p165, 2nd ed. Note that Goldstein presents
-    the formula for clockwise rotation.
+    the formula for clockwise rotation, i.e., with ``np.cross(r, n)``,
+    so the sign of the sine term is flipped here to rotate CCW for
+    ``th > 0``.
 
     """
 
@@ -11,7 +11,7 @@ if __name__ == "__main__":
           url="https://github.com/mkelley/sbsearch",
           packages=find_packages(),
           install_requires=['numpy>=1.13', 'astropy<4.0', 'astroquery>=0.4.dev5744', 'sbpy>=0.2.2',
-                            'sqlalchemy>=1.3', 'geoalchemy2'],
+                            'sqlalchemy>=1.3.7', 'geoalchemy2', 'shapely'],
           setup_requires=['pytest-runner'],
           tests_require=['pytest'],
           license='BSD',